@@ -6,9 +6,30 @@ This script is run by GitHub Actions every 15 minutes.
 
 import os
 import json
+import time
+from bisect import bisect_right
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
+
+# Fast JSON decoders for the large search payloads, in preference order;
+# both fall back quietly if not installed. Decoding stays at plain dicts
+# rather than msgspec.Struct views because the processed records are
+# re-serialized into the page as JSON anyway
+try:
+    import msgspec.json
+    MSGSPEC_DECODER = msgspec.json.Decoder()
+except ImportError:
+    MSGSPEC_DECODER = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 START_DATE = datetime(2026, 1, 7)
@@ -20,6 +41,43 @@ JIRA_EMAIL = os.environ.get('JIRA_EMAIL', '')
 JIRA_API_TOKEN = os.environ.get('JIRA_API_TOKEN', '')
 JIRA_BASE_URL = os.environ.get('JIRA_BASE_URL', 'https://collectors.atlassian.net')
 
+# Shared session so concurrent fetches reuse pooled keep-alive connections,
+# with gzip responses and automatic retry/backoff on transient errors.
+# The transport stays on requests + threads rather than httpx/asyncio:
+# nextPageToken pagination is serial per query, the independent queries
+# already run concurrently, and the handful of parallel requests here
+# would not benefit from HTTP/2 multiplexing on one connection
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16, pool_maxsize=16,
+    max_retries=Retry(total=5, backoff_factor=0.5,
+                      status_forcelist=[429, 502, 503, 504],
+                      allowed_methods=['GET', 'POST'],
+                      respect_retry_after_header=True)))
+SESSION.headers.update({
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip, deflate',
+    'Content-Type': 'application/json',
+})
+SESSION.auth = (JIRA_EMAIL, JIRA_API_TOKEN)
+
+# Worker pool size for concurrent JQL queries
+MAX_WORKERS = 8
+
+# Issues per search page. Ask for the most the endpoint allows; if Jira
+# caps a page lower it still returns a nextPageToken, so over-asking is
+# harmless and pagination proceeds in the largest chunks the server permits
+PAGE_SIZE = 1000
+
+# Only the fields process_issues actually reads; 'key' is top-level on the
+# issue and does not belong in the field list
+ISSUE_FIELDS = ['summary', 'status', 'project', 'resolutiondate', 'updated',
+                'assignee', 'issuetype', 'parent']
+
+# Initiatives and epics only need enough to build the drilldown hierarchy;
+# 'updated' feeds the change-detection cache key
+HIERARCHY_FIELDS = ['summary', 'status', 'parent', 'updated']
+
 # Status mappings
 COMPLETION_STATUSES = [
     'Done', 'DONE', 'Ready for Prod Release', 'Pending Deployment', 'Ready for Deploy/Push',
@@ -34,111 +92,146 @@ STATUS_GROUPS = {
     'Done': COMPLETION_STATUSES,
 }
 
+# Flattened lookup tables so the per-issue checks are O(1) instead of
+# scanning every group's status list
+COMPLETION_STATUS_SET = frozenset(COMPLETION_STATUSES)
+STATUS_TO_GROUP = {status.lower(): group
+                   for group, statuses in STATUS_GROUPS.items()
+                   for status in statuses}
+
 def get_status_group(status_name):
     """Get the status group for a given status"""
     if not status_name:
         return 'Other'
-    status_lower = status_name.lower()
-    for group, statuses in STATUS_GROUPS.items():
-        if any(s.lower() == status_lower for s in statuses):
-            return group
-    return 'Other'
+    return STATUS_TO_GROUP.get(status_name.lower(), 'Other')
 
 def is_completed(status):
     """Check if a status is a completion status"""
-    return status in COMPLETION_STATUSES
+    return status in COMPLETION_STATUS_SET
+
+@lru_cache(maxsize=None)
+def normalize_date(date_str):
+    """Validate a YYYY-MM-DD string, returning it or None if malformed.
+
+    Cached because issue timestamps cluster on a handful of distinct
+    dates, so strptime runs once per date instead of once per issue.
+    """
+    try:
+        datetime.strptime(date_str, '%Y-%m-%d')
+    except ValueError:
+        return None
+    return date_str
 
 def get_effective_date(issue):
-    """Get the effective completion date for an issue"""
+    """Get the effective completion date for an issue as a YYYY-MM-DD string"""
     fields = issue.get('fields', {})
     status = fields.get('status', {}).get('name', '')
-    
+
     if status == 'Done':
         date_str = fields.get('resolutiondate')
     else:
         date_str = fields.get('updated')
-    
-    if date_str:
-        try:
-            # Parse ISO format with timezone
-            if 'T' in date_str:
-                date_str = date_str.split('T')[0]
-            return datetime.strptime(date_str, '%Y-%m-%d')
-        except:
-            return None
+
+    if date_str and len(date_str) >= 10:
+        # Jira timestamps are ISO-8601, so the date prefix compares
+        # correctly as a plain string once validated
+        return normalize_date(date_str[:10])
     return None
 
 def generate_intervals():
     """Generate monthly intervals from START_DATE to END_DATE"""
-    from calendar import monthrange
     intervals = []
     current = START_DATE
 
     while current <= END_DATE:
-        # Get the last day of the current month
-        _, last_day = monthrange(current.year, current.month)
-        month_end = datetime(current.year, current.month, last_day)
-
-        # Clip to END_DATE if needed
-        if month_end > END_DATE:
-            month_end = END_DATE
-
-        # Use month name as label
-        month_name = current.strftime('%B %Y')  # e.g., "January 2026"
+        # First day of the next month; the month ends one day before it,
+        # clipped to END_DATE
+        if current.month == 12:
+            next_month = datetime(current.year + 1, 1, 1)
+        else:
+            next_month = datetime(current.year, current.month + 1, 1)
+        month_end = min(next_month - timedelta(days=1), END_DATE)
 
         intervals.append({
             'start': current.strftime('%Y-%m-%d'),
             'end': month_end.strftime('%Y-%m-%d'),
-            'label': month_name
+            'label': current.strftime('%B %Y')  # e.g., "January 2026"
         })
 
-        # Move to first day of next month
-        if current.month == 12:
-            current = datetime(current.year + 1, 1, 1)
-        else:
-            current = datetime(current.year, current.month + 1, 1)
+        current = next_month
 
     return intervals
 
-def fetch_issues_by_jql(jql):
-    """Fetch issues matching a JQL query"""
-    all_issues = []
+def throttle(response):
+    """Back off when Jira signals rate-limit pressure.
+
+    429s are retried with Retry-After by the session's Retry policy; this
+    handles the softer signal, pausing one refill interval when Jira marks
+    a successful response as near the limit so concurrent workers don't
+    push it over.
+    """
+    if response.headers.get('X-RateLimit-NearLimit', '').lower() == 'true':
+        try:
+            interval = float(response.headers.get('X-RateLimit-Interval-Seconds', 1))
+        except ValueError:
+            interval = 1
+        time.sleep(min(interval, 10))
+
+def parse_response(response):
+    """Decode a Jira JSON response with the fastest available decoder"""
+    if MSGSPEC_DECODER is not None:
+        return MSGSPEC_DECODER.decode(response.content)
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def search_pages(jql, fields=ISSUE_FIELDS):
+    """Yield pages of issues for a JQL query, following nextPageToken.
+
+    Raises on HTTP or network errors; callers decide whether a partial
+    result is acceptable.
+    """
+    url = f"{JIRA_BASE_URL}/rest/api/3/search/jql"
     next_page_token = None
 
     while True:
-        url = f"{JIRA_BASE_URL}/rest/api/3/search/jql"
-        headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
-        auth = (JIRA_EMAIL, JIRA_API_TOKEN)
-
         payload = {
             'jql': jql,
-            'maxResults': 100,
-            'fields': ['key', 'summary', 'status', 'project', 'resolutiondate', 'updated',
-                      'assignee', 'issuetype', 'labels', 'parent']
+            'maxResults': PAGE_SIZE,
+            'fields': fields,
+            'fieldsByKeys': True,
+            'expand': []
         }
         if next_page_token:
             payload['nextPageToken'] = next_page_token
 
-        try:
-            response = requests.post(url, json=payload, headers=headers, auth=auth, timeout=30)
-            if response.status_code != 200:
-                return all_issues
+        response = SESSION.post(url, json=payload, timeout=30)
+        if response.status_code != 200:
+            raise RuntimeError(f"Jira API error: {response.status_code} - {response.text}")
+        throttle(response)
 
-            data = response.json()
-            all_issues.extend(data.get('issues', []))
+        data = parse_response(response)
+        yield data.get('issues', [])
 
-            next_page_token = data.get('nextPageToken')
-            if not next_page_token:
-                break
-        except:
-            return all_issues
+        next_page_token = data.get('nextPageToken')
+        if not next_page_token:
+            return
 
+def fetch_issues_by_jql(jql, fields=ISSUE_FIELDS):
+    """Fetch issues matching a JQL query"""
+    all_issues = []
+    try:
+        for page in search_pages(jql, fields):
+            all_issues.extend(page)
+    except (requests.RequestException, RuntimeError) as e:
+        # Keep whatever pages made it through
+        print(f"Warning: partial result for JQL query: {e}")
     return all_issues
 
 def fetch_initiatives():
     """Fetch all initiatives under the portfolio"""
     jql = f'parent = {PORTFOLIO_KEY} AND issuetype = Initiative'
-    initiatives = fetch_issues_by_jql(jql)
+    initiatives = fetch_issues_by_jql(jql, HIERARCHY_FIELDS)
     print(f"Fetched {len(initiatives)} initiatives")
     return initiatives
 
@@ -147,13 +240,17 @@ def fetch_epics_for_initiatives(initiative_keys):
     if not initiative_keys:
         return []
 
-    all_epics = []
     batch_size = 20
+    jqls = []
     for i in range(0, len(initiative_keys), batch_size):
         batch = initiative_keys[i:i+batch_size]
-        jql = f'parent in ({",".join(batch)}) AND issuetype = Epic'
-        epics = fetch_issues_by_jql(jql)
-        all_epics.extend(epics)
+        jqls.append(f'parent in ({",".join(batch)}) AND issuetype = Epic')
+
+    # Each batch is an independent JQL query, so fetch them concurrently
+    all_epics = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for epics in executor.map(lambda q: fetch_issues_by_jql(q, HIERARCHY_FIELDS), jqls):
+            all_epics.extend(epics)
 
     print(f"Fetched {len(all_epics)} epics")
     return all_epics
@@ -164,15 +261,6 @@ def fetch_jira_issues():
         print("Error: Jira credentials not set")
         return [], [], []
 
-    # Fetch initiatives first
-    print("Fetching initiatives...")
-    initiatives = fetch_initiatives()
-
-    # Fetch epics
-    print("Fetching epics...")
-    initiative_keys = [i['key'] for i in initiatives]
-    epics = fetch_epics_for_initiatives(initiative_keys)
-
     # JQL query for pacing dashboard (child issues)
     jql = f'''parent in portfolioChildIssuesOf("{PORTFOLIO_KEY}")
 AND issuetype NOT IN (
@@ -196,64 +284,60 @@ AND NOT (
 )
 ORDER BY resolutiondate DESC, updatedDate ASC'''
 
+    def fetch_children():
+        all_issues = []
+        try:
+            for page in search_pages(jql):
+                all_issues.extend(page)
+        except Exception as e:
+            print(f"Error fetching from Jira: {e}")
+            return None
+        return all_issues
+
+    # The child-issue query is independent of the initiative/epic queries,
+    # so run it in the background while the hierarchy is fetched
     print("Fetching issues from Jira...")
-    all_issues = []
-    next_page_token = None
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        children_future = executor.submit(fetch_children)
 
-    while True:
-        url = f"{JIRA_BASE_URL}/rest/api/3/search/jql"
-        headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
-        auth = (JIRA_EMAIL, JIRA_API_TOKEN)
+        print("Fetching initiatives...")
+        initiatives = fetch_initiatives()
 
-        payload = {
-            'jql': jql,
-            'maxResults': 100,
-            'fields': ['key', 'summary', 'status', 'project', 'resolutiondate', 'updated',
-                      'assignee', 'issuetype', 'labels', 'parent']
-        }
-        if next_page_token:
-            payload['nextPageToken'] = next_page_token
+        print("Fetching epics...")
+        initiative_keys = [i['key'] for i in initiatives]
+        epics = fetch_epics_for_initiatives(initiative_keys)
 
-        try:
-            response = requests.post(url, json=payload, headers=headers, auth=auth, timeout=30)
-            if response.status_code != 200:
-                print(f"Jira API error: {response.status_code} - {response.text}")
-                return [], [], []
+        all_issues = children_future.result()
 
-            data = response.json()
-            all_issues.extend(data.get('issues', []))
-
-            next_page_token = data.get('nextPageToken')
-            if not next_page_token:
-                break
-        except Exception as e:
-            print(f"Error fetching from Jira: {e}")
-            return [], [], []
+    if all_issues is None:
+        return [], [], []
 
     print(f"Fetched {len(all_issues)} child issues from Jira")
     return all_issues, initiatives, epics
 
-def process_initiative(issue):
-    """Process an initiative into a simplified format"""
-    fields = issue.get('fields', {})
-    return {
-        'key': issue.get('key'),
-        'summary': fields.get('summary', ''),
-        'status': fields.get('status', {}).get('name', ''),
-    }
-
-def process_epic(issue):
-    """Process an epic into a simplified format"""
-    fields = issue.get('fields', {})
-    parent_key = None
-    if fields.get('parent'):
-        parent_key = fields['parent'].get('key')
-    return {
-        'key': issue.get('key'),
-        'summary': fields.get('summary', ''),
-        'status': fields.get('status', {}).get('name', ''),
-        'parent': parent_key,
-    }
+def assign_week_labels(processed, pending, intervals):
+    """Assign week labels to completed issues with one bisect per issue.
+
+    pending holds (index into processed, effective date) pairs; interval
+    starts are sorted, so a bisect over the precomputed start column finds
+    each issue's interval directly.
+    """
+    if not pending or not intervals:
+        return
+
+    starts = [i['start'] for i in intervals]
+    ends = [i['end'] for i in intervals]
+    labels = [i['label'] for i in intervals]
+
+    for idx, date in pending:
+        # Index of the interval whose start is at or before the date
+        pos = bisect_right(starts, date) - 1
+        if pos >= 0:
+            if date <= ends[pos]:
+                processed[idx]['weekLabel'] = labels[pos]
+        else:
+            # Completed before the window starts: count in the first interval
+            processed[idx]['weekLabel'] = labels[0]
 
 def process_issues(issues, intervals, initiatives=None, epics=None):
     """Process issues into a structured format for the dashboard"""
@@ -262,53 +346,66 @@ def process_issues(issues, intervals, initiatives=None, epics=None):
     issue_types = set()
     status_groups = set()
 
-    # Process initiatives
+    # Initiatives and epics are simple projections; build them inline in
+    # one pass each instead of through per-item helper calls
     processed_initiatives = []
-    if initiatives:
-        for init in initiatives:
-            processed_initiatives.append(process_initiative(init))
+    for init in initiatives or []:
+        fields = init.get('fields', {})
+        processed_initiatives.append({
+            'key': init.get('key'),
+            'summary': fields.get('summary', ''),
+            'status': fields.get('status', {}).get('name', ''),
+        })
 
-    # Process epics
     processed_epics = []
-    if epics:
-        for epic in epics:
-            processed_epics.append(process_epic(epic))
+    for epic in epics or []:
+        fields = epic.get('fields', {})
+        parent = fields.get('parent')
+        processed_epics.append({
+            'key': epic.get('key'),
+            'summary': fields.get('summary', ''),
+            'status': fields.get('status', {}).get('name', ''),
+            'parent': parent.get('key') if parent else None,
+        })
+
+    # Completed issues get their week label assigned vectorized after the
+    # loop; collect (index, effective date) pairs as we go
+    pending_labels = []
+
+    # Bind hot names locally so the per-issue work skips repeated global
+    # and bound-method lookups
+    processed_append = processed.append
+    add_issue_type = issue_types.add
+    add_status_group = status_groups.add
 
     for issue in issues:
         fields = issue.get('fields', {})
-        project_key = fields.get('project', {}).get('key', 'Unknown')
-        project_name = fields.get('project', {}).get('name', project_key)
-        status_name = fields.get('status', {}).get('name', '')
-        issue_type = fields.get('issuetype', {}).get('name', 'Unknown')
+        project = fields.get('project') or {}
+        status = fields.get('status') or {}
+        issuetype = fields.get('issuetype') or {}
+        assignee = fields.get('assignee')
+        parent = fields.get('parent')
+
+        project_key = project.get('key', 'Unknown')
+        project_name = project.get('name', project_key)
+        status_name = status.get('name', '')
+        issue_type = issuetype.get('name', 'Unknown')
 
         projects[project_key] = project_name
-        issue_types.add(issue_type)
+        add_issue_type(issue_type)
 
         status_group = get_status_group(status_name)
-        status_groups.add(status_group)
+        add_status_group(status_group)
 
         effective_date = get_effective_date(issue)
-        effective_date_str = effective_date.strftime('%Y-%m-%d') if effective_date else None
-
-        # Determine which week interval this falls into (if completed)
-        week_label = None
-        if is_completed(status_name) and effective_date:
-            for interval in intervals:
-                start = datetime.strptime(interval['start'], '%Y-%m-%d')
-                end = datetime.strptime(interval['end'], '%Y-%m-%d')
-                if start <= effective_date <= end:
-                    week_label = interval['label']
-                    break
-            # If completed before start date, put in first week
-            if not week_label and effective_date < START_DATE:
-                week_label = intervals[0]['label'] if intervals else None
-
-        # Get parent key for drilldown
-        parent_key = None
-        if fields.get('parent'):
-            parent_key = fields['parent'].get('key')
-
-        processed.append({
+        completed = is_completed(status_name)
+
+        # Completed issues fall into a week interval; record them for the
+        # vectorized assignment below
+        if completed and effective_date:
+            pending_labels.append((len(processed), effective_date))
+
+        processed_append({
             'key': issue.get('key'),
             'summary': fields.get('summary', ''),
             'status': status_name,
@@ -316,13 +413,15 @@ def process_issues(issues, intervals, initiatives=None, epics=None):
             'project': project_key,
             'projectName': project_name,
             'issueType': issue_type,
-            'assignee': fields.get('assignee', {}).get('displayName', 'Unassigned') if fields.get('assignee') else 'Unassigned',
-            'isCompleted': is_completed(status_name),
-            'effectiveDate': effective_date_str,
-            'weekLabel': week_label,
-            'parent': parent_key
+            'assignee': assignee.get('displayName', 'Unassigned') if assignee else 'Unassigned',
+            'isCompleted': completed,
+            'effectiveDate': effective_date,
+            'weekLabel': None,
+            'parent': parent.get('key') if parent else None
         })
 
+    assign_week_labels(processed, pending_labels, intervals)
+
     return {
         'issues': processed,
         'initiatives': processed_initiatives,
@@ -333,21 +432,45 @@ def process_issues(issues, intervals, initiatives=None, epics=None):
         'intervals': intervals,
         'startDate': START_DATE.strftime('%Y-%m-%d'),
         'endDate': END_DATE.strftime('%Y-%m-%d'),
-        'lastUpdated': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+        'lastUpdated': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
     }
 
-def generate_html(data):
-    """Generate the static HTML dashboard"""
+def dashboard_cache_key(issues, initiatives, epics):
+    """Cache key that changes whenever the fetched Jira data changes.
+
+    The latest 'updated' timestamp across everything fetched is the
+    high-water mark; the counts catch issues dropping out of the queries
+    entirely.
+    """
+    latest = ''
+    for issue in issues + initiatives + epics:
+        updated = issue.get('fields', {}).get('updated') or ''
+        if updated > latest:
+            latest = updated
+    return f"{latest}|{len(issues)}|{len(initiatives)}|{len(epics)}"
+
+def write_dashboard(data, output_path):
+    """Write the static HTML dashboard with the data injected as JSON"""
     # Read the template
     template_path = os.path.join(os.path.dirname(__file__), 'dashboard_template.html')
     with open(template_path, 'r') as f:
         template = f.read()
 
-    # Inject the data as JSON
-    data_json = json.dumps(data, indent=2)
-    html = template.replace('__DASHBOARD_DATA__', data_json)
+    # Serialize compactly - the JSON is only read by the page's script,
+    # and indentation roughly doubled its size
+    if orjson is not None:
+        data_json = orjson.dumps(data).decode()
+    else:
+        data_json = json.dumps(data, separators=(',', ':'))
 
-    return html
+    # Split at the placeholder once and stream the three pieces straight
+    # to the output file, instead of building the full page in memory via
+    # template.replace
+    before, after = template.split('__DASHBOARD_DATA__', 1)
+    with open(output_path, 'w') as f:
+        f.write(before)
+        f.write(data_json)
+        f.write(after)
 
 def main():
     """Main entry point"""
@@ -361,6 +484,22 @@ def main():
         print("No issues fetched, exiting")
         return False
 
+    docs_dir = os.path.join(os.path.dirname(__file__), 'docs')
+    output_path = os.path.join(docs_dir, 'index.html')
+    cache_path = os.path.join(docs_dir, '.dashboard_cache')
+
+    # Skip regeneration when nothing changed since the last run; the key
+    # lives in docs/ so the scheduled workflow commits it with the page
+    cache_key = dashboard_cache_key(issues, initiatives, epics)
+    if os.path.exists(output_path):
+        try:
+            with open(cache_path, 'r') as f:
+                if f.read().strip() == cache_key:
+                    print("Jira data unchanged since last run, dashboard is up to date")
+                    return True
+        except OSError:
+            pass
+
     # Generate intervals
     intervals = generate_intervals()
 
@@ -373,16 +512,11 @@ def main():
     print(f"Issue types: {data['issueTypes']}")
     print(f"Status groups: {data['statusGroups']}")
 
-    # Generate HTML
-    html = generate_html(data)
-
     # Write to docs folder (for GitHub Pages)
-    docs_dir = os.path.join(os.path.dirname(__file__), 'docs')
     os.makedirs(docs_dir, exist_ok=True)
-
-    output_path = os.path.join(docs_dir, 'index.html')
-    with open(output_path, 'w') as f:
-        f.write(html)
+    write_dashboard(data, output_path)
+    with open(cache_path, 'w') as f:
+        f.write(cache_key)
 
     print(f"Dashboard generated: {output_path}")
     print(f"Last updated: {data['lastUpdated']}")